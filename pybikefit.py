@@ -17,10 +17,27 @@
 import argparse
 import json
 import math
+import sys
+import weakref
 
 import matplotlib.patches as mpatches
+from matplotlib.collections import EllipseCollection, LineCollection
 import matplotlib.pyplot as plt
 
+try:
+    # orjson is optional, it parses bytes directly and is faster than json
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# math functions used on the scalar geometry paths, bound once so each call
+# skips the attribute lookup on the math module
+_cos = math.cos
+_hypot = math.hypot
+_radians = math.radians
+_sin = math.sin
+_sqrt = math.sqrt
+
 __author__ = 'cschone'
 __status__ = 'dev'
 __title__ = 'Py Bike Fit'
@@ -48,15 +65,18 @@ def init_args():
 
 
 def get_vector_coords(x1, y1, length, angle_deg):
-    """ find the end point coordinates of a vector
+    """ find the end point coordinates of a vector. The Bicycle geometry uses
+        its cached tube trig instead, this is kept for one-off vectors.
     :param x1:      start point
     :param y1:      start point
     :param length:  vector magnitude
     :param angle_deg: vector angle (degrees)
     :return: [start_x, end_x], [start_y, end_y]
     """
-    y2 = y1 + length * math.sin(math.pi - math.radians(angle_deg))
-    x2 = x1 + length * math.cos(math.pi - math.radians(angle_deg))
+    # sin(pi - a) == sin(a) and cos(pi - a) == -cos(a)
+    angle_rad = _radians(angle_deg)
+    y2 = y1 + length * _sin(angle_rad)
+    x2 = x1 - length * _cos(angle_rad)
     return [x1, x2], [y1, y2]
 
 
@@ -68,13 +88,53 @@ def get_distance_between_coords(x1, y1, x2, y2):
     :param y2:  end_y
     :return:    length of hypotenuse
     """
-    return math.sqrt(math.pow(x2 - x1, 2) + math.pow(y2 - y1, 2))
+    return _hypot(x2 - x1, y2 - y1)
+
+
+# frame tubes in drawing order, see Bicycle.get_geometry
+FRAME_SEGMENTS = ('chainstay', 'fork', 'head_tube', 'seat_stay', 'seat_tube', 'down_tube', 'top_tube')
+# every line of a bike in drawing order, the seat post and saddle are only
+# there for bikes built with a rider
+LINE_SEGMENTS = ('seat_post', 'saddle') + FRAME_SEGMENTS + ('steer_tube', 'stem')
+
+
+def get_circle_collection(ax, centers, diameters, colors, linestyles):
+    """ Outlined circles sized in data units, as a single collection
+    :param ax:          matplotlib Axes the collection will be added to
+    :param centers:     sequence of (x, y) circle centers
+    :param diameters:   sequence of circle diameters
+    :param colors:      edge color, or one per circle
+    :param linestyles:  line style, or one per circle
+    :return:    matplotlib.collections.EllipseCollection
+    """
+    return EllipseCollection(widths=diameters,
+                             heights=diameters,
+                             angles=0,
+                             units='xy',
+                             offsets=centers,
+                             offset_transform=ax.transData,
+                             facecolors='none',
+                             edgecolors=colors,
+                             linestyles=linestyles)
+
+
+def print_all_specs(items):
+    """ Writes the specs of several objects to stdout in a single write
+        rather than a print call per line.
+    :param items:   objects with a get_specs() method, e.g. Bicycle or Rider
+    """
+    lines = []
+    for item in items:
+        lines.extend(item.get_specs())
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 class Rider(object):
     """ Rider specific dimensions.
     """
 
+    __slots__ = ('saddle_height', 'saddle_length', 'saddle_set_back')
+
     def __init__(self,
                  saddle_height=810,
                  saddle_length=280,
@@ -83,11 +143,14 @@ class Rider(object):
         self.saddle_length = saddle_length
         self.saddle_set_back = saddle_set_back
 
+    def get_specs(self):
+        return ["Rider:",
+                f"\tsaddle_height:\t{self.saddle_height}",
+                f"\tsaddle_length:\t{self.saddle_length}",
+                f"\tsaddle_set_back:\t{self.saddle_set_back}"]
+
     def print_specs(self):
-        print("Rider:")
-        print("\tsaddle_height:\t%s" % self.saddle_height)
-        print("\tsaddle_length:\t%s" % self.saddle_length)
-        print("\tsaddle_set_back:\t%s" % self.saddle_set_back)
+        print_all_specs([self])
 
 
 class Bicycle(object):
@@ -98,6 +161,22 @@ class Bicycle(object):
     STEM_HEIGHT = 50
     HANDLEBAR_DIAMETER = 31.6
 
+    __slots__ = (
+        # public members
+        'color_str', 'frame_size', 'name',
+        # dimensions
+        '_chainstay_length', '_fork_length', '_fork_offset', '_head_tube_angle', '_head_tube_length',
+        '_seat_tube_angle', '_seat_tube_length', '_stem_angle', '_stem_length', '_wheelbase',
+        '_wheel_diameter',
+        # cached trig
+        '_head_tube_sin', '_head_tube_cos', '_seat_tube_sin', '_seat_tube_cos', '_stem_sin', '_stem_cos',
+        # cached geometry
+        '_rear_hub', '_front_hub', '_head_tube', '_seat_tube', '_steer_tube',
+        '_stem',
+        # components
+        '_bb', '_rear_wheel', '_front_wheel', '_saddle',
+    )
+
     def __init__(self,
                  name="Example",
                  frame_size="Large",
@@ -132,21 +211,43 @@ class Bicycle(object):
         self._wheelbase = float(wheelbase)
         self._wheel_diameter = float(wheel_diameter)
 
+        # Tube angle trig, shared by the head tube, fork, steer tube and seat
+        # tube geometry. The angles are not changed after construction.
+        head_tube_rad = _radians(self._head_tube_angle)
+        self._head_tube_sin = _sin(head_tube_rad)
+        self._head_tube_cos = _cos(head_tube_rad)
+        seat_tube_rad = _radians(self._seat_tube_angle)
+        self._seat_tube_sin = _sin(seat_tube_rad)
+        self._seat_tube_cos = _cos(seat_tube_rad)
+
         # BB
-        self._bb = self.BottomBracket(bb_diameter, bb_drop, wheel_diameter)
+        self._bb = self.BottomBracket(bb_diameter, bb_drop, self._wheel_diameter)
+
+        # Frame geometry is fixed once the bike is built, so compute it once
+        # here instead of on every draw / get_specs call.
+        self._rear_hub = self._rear_hub_coords()
+        self._front_hub = self._front_hub_coords()
+        self._head_tube = self._head_tube_coords()
+        self._seat_tube = self._seat_tube_coords()
+        self._steer_tube = self._steer_tube_coords()
 
         # Wheels
-        x, y = self._rear_hub_coords()
+        x, y = self._rear_hub
         self._rear_wheel = self.Wheel([x, y],
                                       color_str=self.color_str,
                                       diameter=self._wheel_diameter)
-        x, y = self._front_hub_coords()
+        x, y = self._front_hub
         self._front_wheel = self.Wheel([x, y],
                                        color_str=self.color_str,
                                        diameter=self._wheel_diameter)
         # Stem
         self._stem_angle = float(stem_angle)
         self._stem_length = float(stem_length)
+        # stem direction: perpendicular to the steerer, tilted by the stem angle
+        stem_rad = _radians(self._head_tube_angle - self._stem_angle + 90)
+        self._stem_sin = _sin(stem_rad)
+        self._stem_cos = _cos(stem_rad)
+        self._stem = self._stem_coords()
 
         # Saddle
         self._saddle = None
@@ -154,63 +255,119 @@ class Bicycle(object):
             self._saddle = self.Saddle(saddle_height=rider.saddle_height,
                                        saddle_length=rider.saddle_length,
                                        saddle_set_back=rider.saddle_set_back,
-                                       bb_coords=self._bb.get_coord(),
-                                       seat_tube_angle=self._seat_tube_angle,
+                                       bb_coords=self._bb.coord,
+                                       seat_tube_sin=self._seat_tube_sin,
+                                       seat_tube_cos=self._seat_tube_cos,
                                        color_str=self.color_str)
 
+    def get_specs(self):
+        return (["Info:",
+                 f"\tname:\t{self.name}",
+                 f"\tsize:\t{self.frame_size}"] +
+                self._bb.get_specs() +
+                self._chainstay_specs() +
+                self._fork_specs() +
+                self._head_tube_specs() +
+                self._seat_tube_specs() +
+                self._stem_specs() +
+                self._top_and_down_tube_specs())
+
     def print_specs(self):
-        print("Info:")
-        print("\tname:\t%s" % self.name)
-        print("\tsize:\t%s" % self.frame_size)
-        self._bb.print_specs()
-        self._chainstay_print_specs()
-        self._fork_print_specs()
-        self._head_tube_print_specs()
-        self._seat_tube_print_specs()
-        self._stem_print_specs()
-        self._top_and_down_tube_print_specs()
-
-    def draw(self):
-        self._front_wheel.draw()
-        self._rear_wheel.draw()
+        print_all_specs([self])
+
+    def get_geometry(self):
+        """ End points of every part of the bike.
+        :return:    dict of LINE_SEGMENTS names to [start_x, end_x],
+                    [start_y, end_y], and of 'bb', 'rear_hub' and 'front_hub'
+                    to (x, y). 'seat_post' and 'saddle' are left out for a bike
+                    built without a rider.
+        """
+        bb_x, bb_y = self._bb.coord
+        rear_hub_x, rear_hub_y = self._rear_hub
+        head_tube_x, head_tube_y = self._head_tube
+        seat_tube_x, seat_tube_y = self._seat_tube
+        geometry = {
+            'bb': (bb_x, bb_y),
+            'rear_hub': self._rear_hub,
+            'front_hub': self._front_hub,
+            'chainstay': ([bb_x, rear_hub_x], [bb_y, rear_hub_y]),
+            # fork axis, from the head tube bottom back down the steering axis
+            'fork': ([head_tube_x[0], head_tube_x[0] + self._fork_length * self._head_tube_cos],
+                     [head_tube_y[0], head_tube_y[0] - self._fork_length * self._head_tube_sin]),
+            'head_tube': self._head_tube,
+            'seat_stay': ([seat_tube_x[1], rear_hub_x], [seat_tube_y[1], rear_hub_y]),
+            'seat_tube': self._seat_tube,
+            # top and down tube positions are estimated from the head and
+            # seat tube ends
+            'down_tube': ([head_tube_x[0], seat_tube_x[0]], [head_tube_y[0], seat_tube_y[0]]),
+            'top_tube': ([head_tube_x[1], seat_tube_x[1]], [head_tube_y[1], seat_tube_y[1]]),
+            'steer_tube': self._steer_tube,
+            'stem': self._stem,
+        }
         if self._saddle:
-            self._saddle.draw()
+            geometry['seat_post'], geometry['saddle'] = self._saddle.get_coords()
+        return geometry
 
-        self._bb.draw(self.color_str)
-        self._chainstay_draw()
-        self._fork_draw()
-        self._head_tube_draw()
-        self._seat_stay_draw()
-        self._seat_tube_draw()
-        self._stem_draw()
-        self._top_and_down_tube_draw()
+    def get_circles(self):
+        """ Hub, wheel, BB and handlebar circles, in drawing order.
+        :return:    [(center, diameter, linestyle), ...]
+        """
+        circles = []
+        self._front_wheel.add_circles(circles)
+        self._rear_wheel.add_circles(circles)
+        self._bb.add_circles(circles)
+        self._handlebar_circle(circles)
+        return circles
+
+    def get_lines(self):
+        """ Saddle, frame tube, steer tube and stem line segments, in drawing
+            order.
+        :return:    [[(start_x, start_y), (end_x, end_y)], ...], line widths
+        """
+        line_width = plt.rcParams['lines.linewidth']
+        geometry = self.get_geometry()
+        segments = []
+        linewidths = []
+        for name in LINE_SEGMENTS:
+            if name in geometry:
+                x, y = geometry[name]
+                segments.append([(x[0], y[0]), (x[1], y[1])])
+                # the frame tubes are drawn thicker, except the fork axis
+                linewidths.append(2 if name in FRAME_SEGMENTS and name != 'fork' else line_width)
+        return segments, linewidths
+
+    def draw(self, ax):
+        """ Draws the bike on the given axes, as one collection of circles and
+            one of lines rather than one artist per part.
+        :param ax:  matplotlib Axes
+        """
+        centers, diameters, linestyles = zip(*self.get_circles())
+        ax.add_collection(get_circle_collection(ax, centers, diameters, self.color_str, linestyles))
+        segments, linewidths = self.get_lines()
+        # match the line width and cap style ax.plot would have used
+        ax.add_collection(LineCollection(segments,
+                                         colors=self.color_str,
+                                         linewidths=linewidths,
+                                         capstyle=plt.rcParams['lines.solid_capstyle']))
 
     class BottomBracket(object):
-        def __init__(self, diameter, drop, wheel_diameter):
-            self._coord = [0, wheel_diameter / 2 - drop]
-            self._diameter = diameter
-            self._drop = drop
+        __slots__ = ('coord', 'diameter', 'drop')
 
-        def get_coord(self):
-            return self._coord
-
-        def get_diameter(self):
-            return self._diameter
+        def __init__(self, diameter, drop, wheel_diameter):
+            self.diameter = float(diameter)
+            self.drop = float(drop)
+            self.coord = [0.0, float(wheel_diameter) / 2 - self.drop]
 
-        def get_drop(self):
-            return self._drop
+        def add_circles(self, circles):
+            circles.append((self.coord, self.diameter, 'solid'))
 
-        def draw(self, color_str):
-            bb_plot = plt.Circle(self._coord,
-                                 self._diameter / 2,
-                                 fill=False,
-                                 color=color_str)
-            ax.add_artist(bb_plot)
+        def get_specs(self):
+            return ["Bottom Bracket",
+                    f"\tbb diameter:\t{self.diameter:.2f}",
+                    f"\tbb drop:\t{self.drop:.2f}"]
 
         def print_specs(self):
-            print("Bottom Bracket")
-            print("\tbb diameter:\t%.2f" % self._diameter)
-            print("\tbb drop:\t%.2f" % self._drop)
+            print_all_specs([self])
 
     class Wheel(object):
         """
@@ -218,198 +375,237 @@ class Bicycle(object):
             http://www.bikecalc.com/wheel_size_math
         """
 
+        HUB_DIAMETER = 40
+
+        __slots__ = ('_coord', '_diameter', '_color_str')
+
         def __init__(self, axel_coord, diameter=700.0, color_str='b'):
             self._coord = axel_coord
             self._diameter = diameter
             self._color_str = color_str
 
-        def draw(self):
-            hub_plot = plt.Circle(self._coord, 20, fill=False, linestyle='dotted', color=self._color_str)
-            ax.add_artist(hub_plot)
-            wheel_plot = plt.Circle(self._coord,
-                                    self._diameter / 2,
-                                    fill=False,
-                                    linestyle='dotted',
-                                    color=self._color_str)
-            ax.add_artist(wheel_plot)
+        def add_circles(self, circles):
+            circles.append((self._coord, self.HUB_DIAMETER, 'dotted'))
+            circles.append((self._coord, self._diameter, 'dotted'))
+
+        def get_specs(self):
+            return ["Wheel",
+                    f"\t diameter:\t{self._diameter:.2f}"]
 
         def print_specs(self):
-            print("Wheel\n\t diameter:\t%.2f" % self._diameter)
+            print_all_specs([self])
 
     class Saddle(object):
+        __slots__ = ('_saddle_height', '_saddle_length', '_saddle_set_back', '_bb_coords', '_color_str',
+                     '_seat_tube_sin', '_seat_tube_cos')
 
         def __init__(self,
                      saddle_height,
                      saddle_length,
                      saddle_set_back,
                      bb_coords,
-                     seat_tube_angle,
+                     seat_tube_sin,
+                     seat_tube_cos,
                      color_str='b'):
             self._saddle_height = saddle_height
             self._saddle_length = saddle_length
             self._saddle_set_back = saddle_set_back
-            self._seat_tube_angle = seat_tube_angle
             self._bb_coords = bb_coords
             self._color_str = color_str
-
-        def draw(self):
-            # draw seat tube
+            # sin / cos of the seat tube angle, as cached by the Bicycle
+            self._seat_tube_sin = seat_tube_sin
+            self._seat_tube_cos = seat_tube_cos
+
+        def get_coords(self):
+            """ Seat post and saddle end points, drawn by the Bicycle as part
+                of its LineCollection.
+            :return:    ([start_x, end_x], [start_y, end_y]) of the seat post
+                        and of the saddle
+            """
             x, y = self._seat_tube_coords()
-            ax.plot(x, y, self._color_str)
-
-            # draw saddle
             seat_x = [x[1] - self._saddle_length / 2 - self._saddle_set_back,
                       x[1] + self._saddle_length / 2 - self._saddle_set_back]
-            seat_y = [y[1], y[1]]
-            ax.plot(seat_x, seat_y, self._color_str)
+            return (x, y), (seat_x, [y[1], y[1]])
+
+        def get_specs(self):
+            return ["Saddle",
+                    f"\tsaddle height:\t{self._saddle_height:.2f}",
+                    f"\tsaddle length:\t{self._saddle_length:.2f}"]
 
         def print_specs(self):
-            print("Saddle")
-            print("\tsaddle height:\t%.2f" % self._saddle_height)
-            print("\tsaddle length:\t%.2f" % self._saddle_length)
+            print_all_specs([self])
 
         def _seat_tube_coords(self):
-            return get_vector_coords(self._bb_coords[0], self._bb_coords[1],
-                                     self._saddle_height, self._seat_tube_angle)
+            bb_x, bb_y = self._bb_coords
+            return ([bb_x, bb_x - self._saddle_height * self._seat_tube_cos],
+                    [bb_y, bb_y + self._saddle_height * self._seat_tube_sin])
 
-    def _chainstay_draw(self):
-        rear_hub_x, rear_hub_y = self._rear_hub_coords()
-        bb_x, bb_y = self._bb.get_coord()
-        ax.plot([bb_x, rear_hub_x],
-                [bb_y, rear_hub_y],
-                self.color_str, linewidth=2)
-
-    def _chainstay_print_specs(self):
-        print("Chainstay")
-        print("\tlength:\t%.2f" % self._chainstay_length)
+    def _chainstay_specs(self):
+        return ["Chainstay",
+                f"\tlength:\t{self._chainstay_length:.2f}"]
 
     def _front_hub_coords(self):
-        rear_x, rear_y = self._rear_hub_coords()
+        rear_x, rear_y = self._rear_hub
         return rear_x + self._wheelbase, rear_y
 
-    def _fork_draw(self):
-        # draw fork axis
-        head_tube_x, head_tube_y = self._head_tube_coords()
-        fork_x, fork_y = get_vector_coords(head_tube_x[0], head_tube_y[0],
-                                           self._fork_length, -180 + self._head_tube_angle)
-        ax.plot(fork_x, fork_y, self.color_str)
-
-    def _fork_print_specs(self):
-        print("Fork")
-        print("\tlength:\t%.2f" % self._fork_length)
-        print("\toffset:\t%.2f" % self._fork_offset)
+    def _fork_specs(self):
+        return ["Fork",
+                f"\tlength:\t{self._fork_length:.2f}",
+                f"\toffset:\t{self._fork_offset:.2f}"]
 
-    def _head_tube_draw(self):
-        x, y = self._head_tube_coords()
-        ax.plot(x, y, self.color_str, linewidth=2)
+    def _handlebar_circle(self, circles):
+        # handlebar mount sits at the end of the stem
+        x, y = self._stem
+        circles.append(((x[1], y[1]), self.HANDLEBAR_DIAMETER, 'solid'))
 
     def _head_tube_coords(self):
         """ Calculate head tube coordinates based on fork offset, fork length,
             wheelbase, head tube length and angle. A bit of trig required.
         :return: [start_x, end_x], [start_y, end_y]
         """
+        sin_ht = self._head_tube_sin
+        cos_ht = self._head_tube_cos
+
         # find point head tube axis crosses y = 0
-        x_offset = self._fork_offset / math.cos(math.radians(90 - self._head_tube_angle))
+        # (cos(90 - a) == sin(a))
+        x_offset = self._fork_offset / sin_ht
 
         # find front hub
-        rear_hub_x, rear_hub_y = self._rear_hub_coords()
+        rear_hub_x, rear_hub_y = self._rear_hub
         head_tube_x_origin = rear_hub_x + self._wheelbase - x_offset
 
         # find head tube bottom
-        head_tube_bottom_x, head_tube_bottom_y = get_vector_coords(
-            head_tube_x_origin,
-            rear_hub_y,
-            self._fork_length,
-            self._head_tube_angle)
+        head_tube_bottom_x = head_tube_x_origin - self._fork_length * cos_ht
+        head_tube_bottom_y = rear_hub_y + self._fork_length * sin_ht
 
         # find head tube top
-        return get_vector_coords(
-            head_tube_bottom_x[1],
-            head_tube_bottom_y[1],
-            self._head_tube_length,
-            self._head_tube_angle
-        )
-
-    def _head_tube_print_specs(self):
-        print("Head Tube")
-        print("\tangle:\t%.2f" % self._head_tube_angle)
-        print("\tlength:\t%.2f" % self._head_tube_length)
+        head_tube_top_x = head_tube_bottom_x - self._head_tube_length * cos_ht
+        head_tube_top_y = head_tube_bottom_y + self._head_tube_length * sin_ht
+        return [head_tube_bottom_x, head_tube_top_x], [head_tube_bottom_y, head_tube_top_y]
+
+    def _head_tube_specs(self):
+        return ["Head Tube",
+                f"\tangle:\t{self._head_tube_angle:.2f}",
+                f"\tlength:\t{self._head_tube_length:.2f}"]
 
     def _rear_hub_coords(self):
-        x = - math.sqrt(math.pow(self._chainstay_length, 2) - math.pow(self._bb.get_drop(), 2))
+        chainstay = self._chainstay_length
+        drop = self._bb.drop
+        x = - _sqrt(chainstay * chainstay - drop * drop)
         y = self._wheel_diameter / 2
         return x, y
 
-    def _seat_stay_coords(self):
-        seat_x, seat_y = self._seat_tube_coords()
-        rear_hub_x, rear_hub_y = self._rear_hub_coords()
-        return [seat_x[1], rear_hub_x], [seat_y[1], rear_hub_y]
-
-    def _seat_stay_draw(self):
-        x, y = self._seat_stay_coords()
-        ax.plot(x, y, self.color_str, linewidth=2)
-
     def _seat_tube_coords(self):
-        bb_x, bb_y = self._bb.get_coord()
-        return get_vector_coords(bb_x, bb_y, self._seat_tube_length, self._seat_tube_angle)
-
-    def _seat_tube_draw(self):
-        x, y = self._seat_tube_coords()
-        ax.plot(x, y, self.color_str, linewidth=2)
-
-    def _seat_tube_print_specs(self):
-        print("Seat Tube")
-        print("\tangle:\t%.2f" % self._seat_tube_angle)
-        print("\tlength:\t%.2f" % self._seat_tube_length)
-
-    def _stem_draw(self):
-        # draw steer tube
-        x, y = self._steer_tube_coords()
-        ax.plot(x, y, self.color_str)
-
-        # draw stem
-        x, y = get_vector_coords(x[1], y[1],
-                                 self._stem_length + (self.HANDLEBAR_DIAMETER / 2),
-                                 self._head_tube_angle - self._stem_angle + 90)
-        ax.plot(x, y, self.color_str)
-
-        # draw handlebar mount
-        hb_plot = plt.Circle((x[1], y[1]),
-                             self.HANDLEBAR_DIAMETER / 2,
-                             fill=False,
-                             color=self.color_str)
-        ax.add_artist(hb_plot)
+        bb_x, bb_y = self._bb.coord
+        return ([bb_x, bb_x - self._seat_tube_length * self._seat_tube_cos],
+                [bb_y, bb_y + self._seat_tube_length * self._seat_tube_sin])
+
+    def _seat_tube_specs(self):
+        return ["Seat Tube",
+                f"\tangle:\t{self._seat_tube_angle:.2f}",
+                f"\tlength:\t{self._seat_tube_length:.2f}"]
+
+    def _stem_coords(self):
+        # stem runs from the top of the steer tube to the handlebar center
+        x, y = self._steer_tube
+        length = self._stem_length + (self.HANDLEBAR_DIAMETER / 2)
+        return ([x[1], x[1] - length * self._stem_cos],
+                [y[1], y[1] + length * self._stem_sin])
 
     def _steer_tube_coords(self):
-        x, y = self._head_tube_coords()
-        return get_vector_coords(x[1], y[1],
-                                 self.STEM_HEIGHT,
-                                 self._head_tube_angle)
-
-    def _stem_print_specs(self):
-        print("Stem")
-        print("\tlength:\t%.2f" % self._stem_length)
-
-    def _top_and_down_tube_coords(self):
-        """ Estimates top and down tube positions based on head and seat tube
-            definitions.
-        :return:    [[ht_start_x, ht_end_x], [st_start_x, st_end_x]],
-                    [[ht_start_y, ht_end_y], [st_start_y, st_end_y}]
+        x, y = self._head_tube
+        return ([x[1], x[1] - self.STEM_HEIGHT * self._head_tube_cos],
+                [y[1], y[1] + self.STEM_HEIGHT * self._head_tube_sin])
+
+    def _stem_specs(self):
+        return ["Stem",
+                f"\tlength:\t{self._stem_length:.2f}"]
+
+    def _top_and_down_tube_specs(self):
+        geometry = self.get_geometry()
+        x, y = geometry['top_tube']
+        top_tube = get_distance_between_coords(x[0], y[0], x[1], y[1])
+        x, y = geometry['down_tube']
+        down_tube = get_distance_between_coords(x[0], y[0], x[1], y[1])
+        return ["Top Tube:",
+                f"\tlength:\t{top_tube:.2f}",
+                "Down Tube:",
+                f"\tlength:\t{down_tube:.2f}"]
+
+
+class BikeFleet(object):
+    """ A set of bicycles drawn with one collection for all of their lines and
+        one for all of their circles, rather than a pair per bike. The geometry
+        itself comes from each Bicycle.
+    """
+
+    def __init__(self, bikes):
+        self.bikes = list(bikes)
+
+    def __len__(self):
+        return len(self.bikes)
+
+    def draw_all(self, ax):
+        """ Draws every bike in the set on the given axes. Autoscaling and
+            data limit updates are skipped, so the axes limits should already
+            be set.
+        :param ax:  matplotlib Axes
+        :return:    the collections added to the axes
         """
-        head_tube_x, head_tube_y = self._head_tube_coords()
-        seat_tube_x, seat_tube_y = self._seat_tube_coords()
-        return [head_tube_x, seat_tube_x], [head_tube_y, seat_tube_y]
+        ax.set_autoscale_on(False)
 
-    def _top_and_down_tube_draw(self):
-        x, y = self._top_and_down_tube_coords()
-        ax.plot(x, y, self.color_str, linewidth=2)
+        segments, colors, linewidths = self._segments()
+        lines = LineCollection(segments,
+                               colors=colors,
+                               linewidths=linewidths,
+                               capstyle=plt.rcParams['lines.solid_capstyle'])
 
-    def _top_and_down_tube_print_specs(self):
-        x, y = self._top_and_down_tube_coords()
-        print("Top Tube:")
-        print("\tlength:\t%.2f" % get_distance_between_coords(x[0][1], y[0][1], x[1][1], y[1][1]))
-        print("Down Tube:")
-        print("\tlength:\t%.2f" % get_distance_between_coords(x[0][0], y[0][0], x[1][0], y[1][0]))
+        diameters, centers, colors, linestyles = self._circles()
+        circles = get_circle_collection(ax, centers, diameters, colors, linestyles)
+
+        for collection in (lines, circles):
+            ax.add_collection(collection, autolim=False)
+        return lines, circles
+
+    def _circles(self):
+        """ Hub, wheel, BB and handlebar circles of every bike, ordered bike
+            by bike.
+        :return:    diameters, centers, colors and linestyles
+        """
+        diameters, centers, colors, linestyles = [], [], [], []
+        for bike in self.bikes:
+            for center, diameter, linestyle in bike.get_circles():
+                diameters.append(diameter)
+                centers.append(center)
+                colors.append(bike.color_str)
+                linestyles.append(linestyle)
+        return diameters, centers, colors, linestyles
+
+    def _segments(self):
+        """ Frame, stem and saddle line segments of every bike, ordered bike
+            by bike.
+        :return:    segments, colors and linewidths
+        """
+        segments, colors, linewidths = [], [], []
+        for bike in self.bikes:
+            bike_segments, bike_linewidths = bike.get_lines()
+            segments.extend(bike_segments)
+            colors.extend([bike.color_str] * len(bike_segments))
+            linewidths.extend(bike_linewidths)
+        return segments, colors, linewidths
+
+
+# eight entries so get_color can wrap with a bit mask
+_COLORS = (
+    'b',  # blue
+    'g',  # green
+    'r',  # red
+    'c',  # cyan
+    'm',  # magenta
+    'y',  # yellow
+    'k',  # black
+    'w',  # white
+)
 
 
 def get_color(n):
@@ -417,18 +613,7 @@ def get_color(n):
     :param n:   an integer
     :return:    a valid matploglib color string
     """
-    n %= 8
-    colors = [
-        'b',  # blue
-        'g',  # green
-        'r',  # red
-        'c',  # cyan
-        'm',  # magenta
-        'y',  # yellow
-        'k',  # black
-        'w',  # white
-    ]
-    return colors[n]
+    return _COLORS[n & 7]
 
 
 def get_rider(json_rider_file):
@@ -437,14 +622,15 @@ def get_rider(json_rider_file):
     :return: Rider object
     """
     try:
-        with open(json_rider_file) as rider_file:
-            data = json.load(rider_file)
+        with open(json_rider_file, 'rb') as rider_file:
+            data = json_loads(rider_file.read())
 
             try:
+                spec = data["rider"]
                 return Rider(
-                    saddle_height=data["rider"]["saddle_height"],
-                    saddle_length=data["rider"]["saddle_length"],
-                    saddle_set_back=data["rider"]["saddle_set_back"]
+                    saddle_height=spec["saddle_height"],
+                    saddle_length=spec["saddle_length"],
+                    saddle_set_back=spec["saddle_set_back"]
                 )
             except KeyError as e:
                 print("Error reading Rider JSON")
@@ -464,27 +650,28 @@ def build_bike(json_bike_file, rider=None):
     :return: Bicycle object
     """
     try:
-        with open(json_bike_file) as data_file:
-            data = json.load(data_file)
+        with open(json_bike_file, 'rb') as data_file:
+            data = json_loads(data_file.read())
 
         try:
+            spec = data["bicycle"]
             return Bicycle(
-                name=data["bicycle"]["name"],
-                frame_size=data["bicycle"]["size"],
-                bb_drop=data["bicycle"]["bb_drop"],
-                bb_diameter=data["bicycle"]["bb_diameter"],
-                chainstay_length=data["bicycle"]["chainstay_length"],
-                color_str=data["bicycle"]["color_str"],
-                fork_length=data["bicycle"]["fork_length"],
-                fork_offset=data["bicycle"]["fork_offset"],
-                head_tube_angle=data["bicycle"]["head_tube_angle"],
-                head_tube_length=data["bicycle"]["head_tube_length"],
-                seat_tube_angle=data["bicycle"]["seat_tube_angle"],
-                seat_tube_length=data["bicycle"]["seat_tube_length"],
-                stem_angle=data["bicycle"]["stem_angle"],
-                stem_length=data["bicycle"]["stem_length"],
-                wheelbase=data["bicycle"]["wheelbase"],
-                wheel_diameter=data["bicycle"]["wheel_diameter"],
+                name=spec["name"],
+                frame_size=spec["size"],
+                bb_drop=spec["bb_drop"],
+                bb_diameter=spec["bb_diameter"],
+                chainstay_length=spec["chainstay_length"],
+                color_str=spec["color_str"],
+                fork_length=spec["fork_length"],
+                fork_offset=spec["fork_offset"],
+                head_tube_angle=spec["head_tube_angle"],
+                head_tube_length=spec["head_tube_length"],
+                seat_tube_angle=spec["seat_tube_angle"],
+                seat_tube_length=spec["seat_tube_length"],
+                stem_angle=spec["stem_angle"],
+                stem_length=spec["stem_length"],
+                wheelbase=spec["wheelbase"],
+                wheel_diameter=spec["wheel_diameter"],
                 rider=rider
             )
         except KeyError as e:
@@ -497,6 +684,57 @@ def build_bike(json_bike_file, rider=None):
     return Bicycle()
 
 
+# figure axes reused by render(), keyed by (xlim, ylim)
+_FIG_CACHE = {}
+# artists drawn by the last render() on each axes
+_RENDERED = weakref.WeakKeyDictionary()
+
+
+def _get_cached_ax(xlim=(-1000, 1200), ylim=(-100, 1400)):
+    """ Returns the Axes shared by render() calls, creating the figure on
+        first use or after its window has been closed.
+    :param xlim:    x axis limits
+    :param ylim:    y axis limits
+    :return:        matplotlib Axes
+    """
+    key = (tuple(xlim), tuple(ylim))
+    ax = _FIG_CACHE.get(key)
+    if ax is None or not plt.fignum_exists(ax.figure.number):
+        fig, ax = plt.subplots()
+        fig.canvas.manager.set_window_title(__title__)
+        ax.set_xlim(*xlim)
+        ax.set_ylim(*ylim)
+        ax.grid(True, which='both')
+        # limits are fixed above, skip autoscaling as artists are added
+        ax.set_autoscale_on(False)
+        _FIG_CACHE[key] = ax
+    return ax
+
+
+def render(bikes, ax=None, xlim=(-1000, 1200), ylim=(-100, 1400)):
+    """ Draws the bikes and a legend, replacing whatever a previous render
+        drew on the same axes.
+    :param bikes:   list of Bicycle objects
+    :param ax:      matplotlib Axes, defaults to one reused across calls
+    :param xlim:    x axis limits of the default axes
+    :param ylim:    y axis limits of the default axes
+    :return:        the Axes drawn on
+    """
+    if ax is None:
+        ax = _get_cached_ax(xlim, ylim)
+
+    # clearing the previous bikes is much cheaper than a new figure
+    for artist in _RENDERED.pop(ax, ()):
+        artist.remove()
+
+    bikes = [bike for bike in bikes if bike is not None]
+    labels = [mpatches.Patch(label=bike.name + " " + bike.frame_size, color=bike.color_str)
+              for bike in bikes]
+    _RENDERED[ax] = BikeFleet(bikes).draw_all(ax)
+    ax.legend(handles=labels, loc='upper left')
+    return ax
+
+
 if __name__ == "__main__":
     # execute if run as a script
 
@@ -507,30 +745,15 @@ if __name__ == "__main__":
         rider = get_rider(args.rider)
         rider.print_specs()
 
-    bikes = []
     if args.json:
-        # read JSON files
-        for b in args.json:
-            bikes.append(build_bike(b, rider))
+        # read JSON files, stopping at the first invalid one
+        bikes = [build_bike(b, rider) for b in args.json]
     else:
         # Make an example bike
-        bikes.append(Bicycle())
-
-    # build plot
-    fig, ax = plt.subplots()
-    fig.canvas.manager.set_window_title(__title__)
-    ax.set_xlim(-1000, 1200)
-    ax.set_ylim(-100, 1400)
-    ax.grid(True, which='both')
-
-    labels = []
-    for bike in bikes:
-        if bike is not None:
-            bike.print_specs()
-            bike.draw()
-            labels.append(mpatches.Patch(label=bike.name + " " + bike.frame_size,
-                                         color=bike.color_str))
+        bikes = [Bicycle()]
 
-    ax.legend(handles=labels, loc='upper left')
+    print_all_specs(bike for bike in bikes if bike is not None)
+
+    render(bikes)
 
     plt.show(block=True)